@@ -3,18 +3,101 @@ import os
 import glob
 import numpy as np
 
+def read_excel_file(file_path):
+    """
+    Read a single Excel file without processing it.
+    
+    Returns:
+        DataFrame: The raw sheet, or None if the file could not be read
+    """
+    try:
+        return pd.read_excel(file_path)
+    except Exception as e:
+        print(f"Error reading {file_path}: {str(e)}")
+        return None
+
+# Rows of the selected data holding each section (after the names and reference rows)
+SECTION_ROWS = {
+    "Criteria Weight (Full Order)": slice(2, 4),
+    "Criteria Weight - Top:1": slice(4, 6),
+    "Criteria Weight Normalised (Full Order)": slice(6, 8),
+    "Criteria Weight Normalised - Top:1": slice(8, 10)
+}
+
+def calculate_percentage_change(section_df, reference_data):
+    """
+    Calculate the percentage change of a section relative to the reference data.
+    
+    Args:
+        section_df (DataFrame): Section rows, with the legend as the first column
+        reference_data (Series): Reference values indexed by column name
+        
+    Returns:
+        DataFrame: Percentage changes with the legend column kept first.
+                   Missing values and zero references become infinity.
+    """
+    legend_col = section_df.columns[0]
+    numerical_columns = section_df.columns[1:]
+    
+    # Create a DataFrame for ratios with numerical columns only
+    ratio_df = pd.DataFrame(index=section_df.index, columns=numerical_columns)
+    for col in numerical_columns:
+        for idx in section_df.index:
+            current_value = section_df.loc[idx, col]
+            ref_value = reference_data[col]
+
+            if pd.isna(current_value) or pd.isna(ref_value):
+                ratio_df.loc[idx, col] = float('inf')
+            elif ref_value == 0:
+                ratio_df.loc[idx, col] = float('inf')
+            else:
+                # Convert ratio to percentage
+                ratio_df.loc[idx, col] = ((current_value - ref_value) / ref_value) * 100
+    
+    # Add legend column back to the ratio DataFrame
+    ratio_df.insert(0, legend_col, section_df[legend_col])
+    return ratio_df
+
 class ExcelProcessor:
-    def __init__(self, directory_path=None):
+    def __init__(self, directory_path=None, lazy=False):
         """
         Initialize the ExcelProcessor with an optional directory path.
         If no directory is provided, it will use the 'data' directory.
+        
+        In lazy mode process_directory only indexes the files, and get_section_data
+        reads and computes a section on first access. Lazy mode is opt-in; the
+        Scatter and Tornado scripts use the default eager mode.
         """
         self.directory_path = directory_path or os.path.join(os.getcwd(), 'data')
+        self.lazy = lazy
         self.results = {}
+        # Lazy mode caches, keyed by (file, mtime) and (file, section, mtime)
+        self.file_index = {}
+        self._selected_cache = {}
+        self._section_cache = {}
+
+    def find_excel_files(self):
+        """Get all Excel files in the directory"""
+        return glob.glob(os.path.join(self.directory_path, "*.xlsx")) + \
+               glob.glob(os.path.join(self.directory_path, "*.xls"))
+
+    def read_excel_file(self, file_path):
+        """Read a single Excel file without processing it (see read_excel_file)"""
+        return read_excel_file(file_path)
 
     def process_excel_file(self, file_path):
         """
-        Process a single Excel file and return the processed data.
+        Read and process a single Excel file and return the processed data.
+        See process_dataframe for the returned dictionary.
+        """
+        df = self.read_excel_file(file_path)
+        if df is None:
+            return None
+        return self.process_dataframe(df, file_path)
+
+    def process_dataframe(self, df, file_path):
+        """
+        Process the raw sheet of a single Excel file and return the processed data.
         
         Returns:
             dict: A dictionary containing:
@@ -24,50 +107,10 @@ class ExcelProcessor:
                 - original_data: DataFrame of original selected data
         """
         try:
-            # Read the Excel file
-            df = pd.read_excel(file_path)
-            
-            # Get row 10 (index 9) to determine which columns to initially select
-            row_10 = df.iloc[9]
-            all_selected_columns = [col for col in df.columns if pd.notna(row_10[col]) and row_10[col] != 0]
-
-            if not all_selected_columns:
-                print(f"No valid columns found based on row 10 for {os.path.basename(file_path)}")
+            selected = self._select_data(df, file_path)
+            if selected is None:
                 return None
-
-            # Get the actual names from row 2 (index 1)
-            actual_names = df.iloc[1][all_selected_columns]
-            
-            # Create a mapping of numbered columns to actual names
-            column_mapping = dict(zip(all_selected_columns, actual_names))
-            
-            # Extract data from row 2 (index 1) and rows 10-20 (index 9-19) for selected columns
-            row_2_data = df.iloc[1:2][all_selected_columns]
-            rows_10_to_20_data = df.iloc[9:20][all_selected_columns]
-            selected_data = pd.concat([row_2_data, rows_10_to_20_data])
-            
-            # Rename the columns using the actual names
-            selected_data = selected_data.rename(columns=column_mapping)
-            
-            # Remove rows where the first column of the *concatenated* data is empty
-            if not selected_data.empty:
-                first_column_name = selected_data.columns[0]
-                selected_data = selected_data.dropna(subset=[first_column_name])
-                # Reset index after dropping rows to ensure consistent iloc access
-                selected_data = selected_data.reset_index(drop=True)
-                if selected_data.empty:
-                    print(f"No valid rows after dropping empty in first column for {os.path.basename(file_path)}")
-                    return None
-            else:
-                print(f"No data selected based on row 10 criteria or initial rows for {os.path.basename(file_path)}")
-                return None
-
-            # Identify numerical columns for calculation (all columns except the first one, which is the legend)
-            numerical_columns = selected_data.columns[1:]
-
-            # Explicitly convert numerical columns to numeric, coercing errors to NaN
-            for col in numerical_columns:
-                selected_data[col] = pd.to_numeric(selected_data[col], errors='coerce')
+            selected_data, actual_names = selected
 
             # Get project names from the first row of the original data
             project_names = actual_names
@@ -77,33 +120,13 @@ class ExcelProcessor:
             
             # Define sections using the *numerical data slices* after ensuring all relevant data is loaded
             sections_raw_data = {
-                "Criteria Weight (Full Order)": selected_data.iloc[2:4],
-                "Criteria Weight - Top:1": selected_data.iloc[4:6],
-                "Criteria Weight Normalised (Full Order)": selected_data.iloc[6:8],
-                "Criteria Weight Normalised - Top:1": selected_data.iloc[8:10]
+                section_name: selected_data.iloc[rows] for section_name, rows in SECTION_ROWS.items()
             }
             
             # Calculate ratios for each section, only for numerical columns
             processed_data = {}
             for section_name, section_df in sections_raw_data.items():
-                # Create a DataFrame for ratios with numerical columns only
-                ratio_df = pd.DataFrame(index=section_df.index, columns=numerical_columns)
-                for col in numerical_columns:
-                    for idx in section_df.index:
-                        current_value = section_df.loc[idx, col]
-                        ref_value = reference_data[col]
-
-                        if pd.isna(current_value) or pd.isna(ref_value):
-                            ratio_df.loc[idx, col] = float('inf')
-                        elif ref_value == 0:
-                            ratio_df.loc[idx, col] = float('inf')
-                        else:
-                            # Convert ratio to percentage
-                            ratio_df.loc[idx, col] = ((current_value - ref_value) / ref_value) * 100
-                
-                # Add legend column back to the ratio DataFrame
-                ratio_df.insert(0, selected_data.columns[0], section_df[selected_data.columns[0]])
-                processed_data[section_name] = ratio_df
+                processed_data[section_name] = calculate_percentage_change(section_df, reference_data)
             
             # Store results
             results = {
@@ -120,19 +143,73 @@ class ExcelProcessor:
             print(f"Error processing {file_path}: {str(e)}")
             return None
 
+    def _select_data(self, df, file_path):
+        """
+        Select the weighted columns and the names, reference and section rows from a raw sheet.
+        
+        Returns:
+            tuple: (selected_data, actual_names), or None if nothing could be selected
+        """
+        # Get row 10 (index 9) to determine which columns to initially select
+        row_10 = df.iloc[9]
+        all_selected_columns = [col for col in df.columns if pd.notna(row_10[col]) and row_10[col] != 0]
+
+        if not all_selected_columns:
+            print(f"No valid columns found based on row 10 for {os.path.basename(file_path)}")
+            return None
+
+        # Get the actual names from row 2 (index 1)
+        actual_names = df.iloc[1][all_selected_columns]
+        
+        # Create a mapping of numbered columns to actual names
+        column_mapping = dict(zip(all_selected_columns, actual_names))
+        
+        # Extract data from row 2 (index 1) and rows 10-20 (index 9-19) for selected columns
+        row_2_data = df.iloc[1:2][all_selected_columns]
+        rows_10_to_20_data = df.iloc[9:20][all_selected_columns]
+        selected_data = pd.concat([row_2_data, rows_10_to_20_data])
+        
+        # Rename the columns using the actual names
+        selected_data = selected_data.rename(columns=column_mapping)
+        
+        # Remove rows where the first column of the *concatenated* data is empty
+        if not selected_data.empty:
+            first_column_name = selected_data.columns[0]
+            selected_data = selected_data.dropna(subset=[first_column_name])
+            # Reset index after dropping rows to ensure consistent iloc access
+            selected_data = selected_data.reset_index(drop=True)
+            if selected_data.empty:
+                print(f"No valid rows after dropping empty in first column for {os.path.basename(file_path)}")
+                return None
+        else:
+            print(f"No data selected based on row 10 criteria or initial rows for {os.path.basename(file_path)}")
+            return None
+
+        # Identify numerical columns for calculation (all columns except the first one, which is the legend)
+        numerical_columns = selected_data.columns[1:]
+
+        # Explicitly convert numerical columns to numeric, coercing errors to NaN
+        for col in numerical_columns:
+            selected_data[col] = pd.to_numeric(selected_data[col], errors='coerce')
+
+        return selected_data, actual_names
+
     def process_directory(self, print_results=False):
         """
         Process all Excel files in the specified directory.
         
+        In lazy mode the files are only indexed: nothing is read, print_results has
+        no effect and get_results stays empty. Use get_section_data to get sections.
+        
         Args:
             print_results (bool): Whether to print the results to console (default: False)
             
         Returns:
-            dict: Dictionary containing results for all processed files
+            dict: Dictionary containing results for all processed files.
+                  In lazy mode this is the file index instead: {file_path: {'file_name': ...}}
         """
         # Get all Excel files in the directory
-        excel_files = glob.glob(os.path.join(self.directory_path, "*.xlsx")) + \
-                     glob.glob(os.path.join(self.directory_path, "*.xls"))
+        excel_files = self.find_excel_files()
         
         if not excel_files:
             print("No Excel files found in the directory!")
@@ -140,6 +217,13 @@ class ExcelProcessor:
         
         print(f"Found {len(excel_files)} Excel files")
         
+        if self.lazy:
+            # Sections are read and computed on demand by get_section_data
+            if print_results:
+                print("Lazy mode: files are only indexed, use get_section_data to compute sections")
+            self.file_index = {file: {'file_name': os.path.basename(file)} for file in excel_files}
+            return self.file_index
+        
         # Process each Excel file
         all_results = {}
         for file in excel_files:
@@ -163,7 +247,11 @@ class ExcelProcessor:
             print(section_data)
 
     def get_results(self):
-        """Get the processed results"""
+        """
+        Get the processed results.
+        In lazy mode results are computed per section, so this is empty;
+        use get_section_data instead.
+        """
         return self.results
 
     def get_section_data(self, file_path, section_name):
@@ -177,11 +265,62 @@ class ExcelProcessor:
         Returns:
             DataFrame: The processed data for the specified section
         """
+        if self.lazy:
+            return self._get_section_data_lazy(file_path, section_name)
         if file_path in self.results:
             if section_name in self.results[file_path]['processed_data']:
                 return self.results[file_path]['processed_data'][section_name]
         return None
 
+    def _get_section_data_lazy(self, file_path, section_name):
+        """
+        Read and compute a single section on first access.
+        Results are memoised per (file, section, mtime), so an edited file is re-read.
+        A workbook that fails to process is remembered per (file, mtime) and not re-read.
+        """
+        if section_name not in SECTION_ROWS:
+            return None
+        
+        try:
+            mtime = os.path.getmtime(file_path)
+        except OSError as e:
+            print(f"Error processing {file_path}: {str(e)}")
+            return None
+        
+        section_key = (file_path, section_name, mtime)
+        if section_key in self._section_cache:
+            return self._section_cache[section_key]
+        
+        # Drop entries for older versions of this file
+        self._selected_cache = {key: value for key, value in self._selected_cache.items()
+                                if key[0] != file_path or key[1] == mtime}
+        self._section_cache = {key: value for key, value in self._section_cache.items()
+                               if key[0] != file_path or key[2] == mtime}
+        
+        # The workbook is parsed once and shared by all of its sections; None marks a failure
+        selected_key = (file_path, mtime)
+        if selected_key not in self._selected_cache:
+            df = self.read_excel_file(file_path)
+            selected = None
+            if df is not None:
+                try:
+                    selected = self._select_data(df, file_path)
+                except Exception as e:
+                    print(f"Error processing {file_path}: {str(e)}")
+            self._selected_cache[selected_key] = selected[0] if selected else None
+        selected_data = self._selected_cache[selected_key]
+        if selected_data is None:
+            return None
+        
+        try:
+            section_data = calculate_percentage_change(selected_data.iloc[SECTION_ROWS[section_name]],
+                                                       selected_data.iloc[1])
+        except Exception as e:
+            print(f"Error processing {file_path}: {str(e)}")
+            section_data = None
+        self._section_cache[section_key] = section_data
+        return section_data
+
 def main():
     # Example usage
     processor = ExcelProcessor()
@@ -0,0 +1,188 @@
+import os
+import time
+import queue
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# Marks the end of the stream on a stage queue
+_DONE = object()
+
+class StageCounters:
+    """
+    Thread-safe counters for one pipeline stage.
+    Tracks busy time across the stage's workers and the depth of its output queue
+    (or, for the render stage, the number of jobs in flight).
+    """
+    def __init__(self, name, workers, depth_label="output queue depth"):
+        self.name = name
+        self.workers = workers
+        self.depth_label = depth_label
+        self.items = 0
+        self.busy_time = 0.0
+        self.max_depth = 0
+        self.depth_total = 0
+        self.depth_samples = 0
+        self._lock = threading.Lock()
+
+    def add_busy(self, seconds, items=1):
+        with self._lock:
+            self.busy_time += seconds
+            self.items += items
+
+    def sample_depth(self, depth):
+        with self._lock:
+            self.max_depth = max(self.max_depth, depth)
+            self.depth_total += depth
+            self.depth_samples += 1
+
+    def utilisation(self, wall_time):
+        """Fraction of the available worker time this stage spent doing work"""
+        if wall_time <= 0 or self.workers <= 0:
+            return 0.0
+        return self.busy_time / (wall_time * self.workers)
+
+    def mean_depth(self):
+        return self.depth_total / self.depth_samples if self.depth_samples else 0.0
+
+class PipelineStats:
+    """Counters for every stage of a pipeline run"""
+    def __init__(self, reader_workers, render_workers, queue_size):
+        self.queue_size = queue_size
+        self.reader = StageCounters("read", reader_workers)
+        self.compute = StageCounters("compute", 1)
+        self.render = StageCounters("render", render_workers, depth_label="in-flight jobs")
+        self.wall_time = 0.0
+
+    def stages(self):
+        return [self.reader, self.compute, self.render]
+
+    def print_report(self):
+        """Print stage utilisation and queue depth so the saturated stage is visible"""
+        print(f"\nPipeline finished in {self.wall_time:.2f}s (queue size {self.queue_size})")
+        for stage in self.stages():
+            print(f"  {stage.name:<8} workers={stage.workers:<3} items={stage.items:<5} "
+                  f"utilisation={stage.utilisation(self.wall_time) * 100:5.1f}%  "
+                  f"{stage.depth_label}: mean={stage.mean_depth():.1f} max={stage.max_depth}")
+
+def _timed_render(render, args):
+    """Run a render job in a worker process and report how long it took"""
+    start = time.perf_counter()
+    render(*args)
+    return time.perf_counter() - start
+
+def run_pipeline(items, read, compute, render, reader_workers=4, render_workers=None, queue_size=8):
+    """
+    Run read -> compute -> render over the items as overlapping stages.
+
+    Reader threads handle the I/O-bound reads, a single compute thread turns each read
+    result into render jobs, and a process pool renders them. Stages are joined by
+    bounded queues, so a slow stage blocks the one feeding it instead of letting
+    intermediate data pile up in memory.
+
+    Args:
+        items (list): Inputs for the reader stage (e.g. file paths)
+        read (callable): read(item) -> data, or None to skip the item
+        compute (callable): compute(item, data) -> iterable of argument tuples for render
+        render (callable): Picklable top-level function called as render(*args) in a worker process
+        reader_workers (int): Number of reader threads (default: 4)
+        render_workers (int): Number of render processes (default: CPU count)
+        queue_size (int): Capacity of each stage queue (default: 8). In-flight render jobs are
+            capped at max(queue_size, render_workers), so every render worker can be kept busy
+            and render utilisation is measured against workers that can actually run
+
+    Returns:
+        PipelineStats: Queue-depth and stage-utilisation counters for the run
+    """
+    render_workers = render_workers or os.cpu_count() or 1
+    reader_workers = max(1, min(reader_workers, len(items)))
+    stats = PipelineStats(reader_workers, render_workers, queue_size)
+
+    input_queue = queue.Queue()
+    for item in items:
+        input_queue.put(item)
+
+    read_queue = queue.Queue(maxsize=queue_size)
+    render_queue = queue.Queue(maxsize=queue_size)
+
+    def reader_loop():
+        while True:
+            try:
+                item = input_queue.get_nowait()
+            except queue.Empty:
+                break
+            start = time.perf_counter()
+            try:
+                data = read(item)
+            except Exception as e:
+                print(f"Error reading {item}: {str(e)}")
+                data = None
+            stats.reader.add_busy(time.perf_counter() - start)
+            if data is not None:
+                read_queue.put((item, data))
+                stats.reader.sample_depth(read_queue.qsize())
+        read_queue.put(_DONE)
+
+    def compute_loop():
+        finished_readers = 0
+        while finished_readers < reader_workers:
+            entry = read_queue.get()
+            if entry is _DONE:
+                finished_readers += 1
+                continue
+            item, data = entry
+            start = time.perf_counter()
+            try:
+                jobs = list(compute(item, data))
+            except Exception as e:
+                print(f"Error computing {item}: {str(e)}")
+                jobs = []
+            stats.compute.add_busy(time.perf_counter() - start)
+            for job in jobs:
+                render_queue.put(job)
+                stats.compute.sample_depth(render_queue.qsize())
+        render_queue.put(_DONE)
+
+    start_time = time.perf_counter()
+
+    # Spawn keeps worker processes independent of the reader/compute threads running here
+    with ProcessPoolExecutor(max_workers=render_workers,
+                             mp_context=multiprocessing.get_context("spawn")) as executor:
+        threads = [threading.Thread(target=reader_loop, daemon=True) for _ in range(reader_workers)]
+        threads.append(threading.Thread(target=compute_loop, daemon=True))
+        for thread in threads:
+            thread.start()
+
+        # Cap the number of render jobs submitted but not yet finished; the cap must not
+        # fall below the worker count or the extra workers would never receive a job
+        in_flight = threading.BoundedSemaphore(max(queue_size, render_workers))
+        in_flight_count = [0]
+        in_flight_lock = threading.Lock()
+
+        def on_done(future, job):
+            with in_flight_lock:
+                in_flight_count[0] -= 1
+            in_flight.release()
+            try:
+                stats.render.add_busy(future.result())
+            except Exception as e:
+                # Name the job by its string arguments (title and output path)
+                description = ", ".join(str(arg) for arg in job if isinstance(arg, str))
+                print(f"Error rendering {description}: {str(e)}")
+
+        while True:
+            job = render_queue.get()
+            if job is _DONE:
+                break
+            in_flight.acquire()
+            with in_flight_lock:
+                in_flight_count[0] += 1
+                stats.render.sample_depth(in_flight_count[0])
+            future = executor.submit(_timed_render, render, job)
+            future.add_done_callback(lambda done, job=job: on_done(done, job))
+
+        for thread in threads:
+            thread.join()
+
+    stats.wall_time = time.perf_counter() - start_time
+    return stats
@@ -1,6 +1,7 @@
 import matplotlib.pyplot as plt
 import numpy as np
 from PercentageChang import ExcelProcessor
+from Pipeline import run_pipeline
 import os
 import pandas as pd
 from matplotlib.lines import Line2D
@@ -169,15 +170,25 @@ def create_scatter_plot(data, title, output_path=None):
 def main():
     # Initialize the Excel processor
     processor = ExcelProcessor()
-    results = processor.process_directory(print_results=False)
+    excel_files = processor.find_excel_files()
+    
+    if not excel_files:
+        print("No Excel files found in the directory!")
+        return
+    
+    print(f"Found {len(excel_files)} Excel files")
     
     # Create base output directory if it doesn't exist
     base_output_dir = os.path.join("image", "scatter_plots")
     if not os.path.exists(base_output_dir):
         os.makedirs(base_output_dir)
     
-    # Generate scatter plots for each file and section
-    for file_path, file_results in results.items():
+    def compute(file_path, df):
+        # Turn one workbook into the scatter plots to render
+        file_results = processor.process_dataframe(df, file_path)
+        if not file_results:
+            return
+        
         file_name_without_ext = os.path.splitext(os.path.basename(file_path))[0]
         
         # Create a subdirectory for each Excel file
@@ -190,10 +201,11 @@ def main():
             clean_section_name = section_name.replace(" ", "_").replace("(", "").replace(")", "").replace(":", "_")
             output_path = os.path.join(file_output_dir, f"{clean_section_name}.png")
             
-            # Create and save the scatter plot
-            create_scatter_plot(section_data, 
-                              f"{file_name_without_ext} - {section_name}",
-                              output_path)
+            yield (section_data, f"{file_name_without_ext} - {section_name}", output_path)
+    
+    # Read, compute and render the scatter plots as overlapping stages
+    stats = run_pipeline(excel_files, processor.read_excel_file, compute, create_scatter_plot)
+    stats.print_report()
 
 if __name__ == "__main__":
     main()
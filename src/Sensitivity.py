@@ -0,0 +1,381 @@
+import os
+import glob
+import numpy as np
+import pandas as pd
+from PercentageChang import calculate_percentage_change, read_excel_file
+from Scatter import create_scatter_plot
+from Tornado import create_tornado_diagram
+
+# Fixed ideal / negative ideal points used by app.js for both methods
+IDEAL_POINT = 100.0
+NEGATIVE_IDEAL_POINT = 0.0
+
+# Ranking direction for each method (True = higher score ranks first), as in app.js
+METHOD_DESCENDING = {
+    'topsis': True,
+    'cp': False
+}
+
+SECTION_NAMES = [
+    "Criteria Weight (Full Order)",
+    "Criteria Weight - Top:1",
+    "Criteria Weight Normalised (Full Order)",
+    "Criteria Weight Normalised - Top:1"
+]
+
+def _normalise_values(values):
+    """Scale raw criterion values to [0, 1] relative to the fixed ideal points."""
+    values = np.nan_to_num(np.asarray(values, dtype=float), nan=0.0)
+    return (values - NEGATIVE_IDEAL_POINT) / (IDEAL_POINT - NEGATIVE_IDEAL_POINT)
+
+def _safe_divide(numerator, denominator):
+    """Element-wise division that returns 0 where the denominator is 0."""
+    numerator, denominator = np.broadcast_arrays(numerator, denominator)
+    return np.divide(numerator, denominator, out=np.zeros(numerator.shape), where=denominator != 0)
+
+def topsis_scores(values, weights):
+    """
+    TOPSIS scores of every alternative (higher is better).
+
+    Args:
+        values (array): Raw criterion values, shape (n_alternatives, n_criteria)
+        weights (array): Criterion weights, shape (..., n_criteria); leading
+            dimensions are treated as a batch of weight vectors
+
+    Returns:
+        ndarray: Scores with shape (..., n_alternatives)
+    """
+    v = _normalise_values(values)
+    w = np.asarray(weights, dtype=float)[..., np.newaxis, :]
+    d_plus = np.sqrt(np.sum((w * (1 - v)) ** 2, axis=-1))
+    d_minus = np.sqrt(np.sum((w * v) ** 2, axis=-1))
+    return _safe_divide(d_minus, d_plus + d_minus)
+
+def topsis_jacobian(values, weights):
+    """
+    Closed-form Jacobian of the TOPSIS scores with respect to the weights.
+
+    Args:
+        values (array): Raw criterion values, shape (n_alternatives, n_criteria)
+        weights (array): Criterion weights, shape (..., n_criteria)
+
+    Returns:
+        ndarray: d score[i] / d weight[j] with shape (..., n_alternatives, n_criteria)
+    """
+    v = _normalise_values(values)
+    w = np.asarray(weights, dtype=float)[..., np.newaxis, :]
+    a = (1 - v) ** 2
+    b = v ** 2
+    d_plus = np.sqrt(np.sum(w ** 2 * a, axis=-1))[..., np.newaxis]
+    d_minus = np.sqrt(np.sum(w ** 2 * b, axis=-1))[..., np.newaxis]
+    # dD+/dw_j = w_j * a_j / D+ and dD-/dw_j = w_j * b_j / D-
+    grad_plus = _safe_divide(w * a, d_plus)
+    grad_minus = _safe_divide(w * b, d_minus)
+    return _safe_divide(d_plus * grad_minus - d_minus * grad_plus, (d_plus + d_minus) ** 2)
+
+def cp_scores(values, weights):
+    """
+    Compromise Programming scores of every alternative (lower is better).
+
+    Args:
+        values (array): Raw criterion values, shape (n_alternatives, n_criteria)
+        weights (array): Criterion weights, shape (..., n_criteria)
+
+    Returns:
+        ndarray: Scores with shape (..., n_alternatives)
+    """
+    v = _normalise_values(values)
+    w = np.asarray(weights, dtype=float)
+    d_plus = np.einsum('...j,ij->...i', w, (1 - v) ** 2)
+    d_minus = np.einsum('...j,ij->...i', w, v ** 2)
+    return _safe_divide(d_plus, d_plus + d_minus)
+
+def cp_jacobian(values, weights):
+    """
+    Closed-form Jacobian of the CP scores with respect to the weights.
+
+    Args:
+        values (array): Raw criterion values, shape (n_alternatives, n_criteria)
+        weights (array): Criterion weights, shape (..., n_criteria)
+
+    Returns:
+        ndarray: d score[i] / d weight[j] with shape (..., n_alternatives, n_criteria)
+    """
+    v = _normalise_values(values)
+    w = np.asarray(weights, dtype=float)
+    a = (1 - v) ** 2
+    b = v ** 2
+    d_plus = np.einsum('...j,ij->...i', w, a)[..., np.newaxis]
+    d_minus = np.einsum('...j,ij->...i', w, b)[..., np.newaxis]
+    return _safe_divide(d_minus * a - d_plus * b, (d_plus + d_minus) ** 2)
+
+METHODS = {
+    'topsis': (topsis_scores, topsis_jacobian),
+    'cp': (cp_scores, cp_jacobian)
+}
+
+def _ranking_pairs(values, scores, top_only, descending=True):
+    """
+    Pairs of alternatives whose relative order must hold for the ranking to be stable.
+    Alternatives with identical criterion values always tie and are never paired.
+    """
+    values = np.nan_to_num(np.asarray(values, dtype=float), nan=0.0)
+    n_alternatives = values.shape[0]
+    if top_only:
+        best = np.isclose(scores, scores.max() if descending else scores.min())
+        candidates = [(i, k) for i in np.flatnonzero(best) for k in range(n_alternatives) if not best[k]]
+    else:
+        candidates = [(i, k) for i in range(n_alternatives) for k in range(i + 1, n_alternatives)]
+    pairs = [(i, k) for i, k in candidates if not np.array_equal(values[i], values[k])]
+    return np.array(pairs, dtype=int).reshape(-1, 2)
+
+def stability_intervals(values, weights, method='topsis', top_only=False, n_grid=256, max_iter=50, tol=1e-10):
+    """
+    Compute the range of each criterion's weight share over which the ranking is unchanged.
+
+    Each criterion's share u is varied along the simplex (the other weights are rescaled
+    proportionally so the weights keep summing to one). Sign changes of the pairwise score
+    gaps are bracketed on a batched grid and then refined with a safeguarded Newton
+    iteration whose derivative comes from the closed-form Jacobian.
+
+    Args:
+        values (array): Raw criterion values, shape (n_alternatives, n_criteria)
+        weights (array): Reference criterion weights, shape (n_criteria,)
+        method (str): 'topsis' or 'cp'
+        top_only (bool): Only require the top-ranked alternative to stay first (default: False)
+        n_grid (int): Number of grid points used to bracket crossings (default: 256)
+        max_iter (int): Maximum Newton/bisection iterations (default: 50)
+        tol (float): Convergence tolerance on the bracket width (default: 1e-10)
+
+    Returns:
+        tuple: (minimum_share, maximum_share) arrays of shape (n_criteria,)
+    """
+    score_fn, jacobian_fn = METHODS[method]
+    values = np.nan_to_num(np.asarray(values, dtype=float), nan=0.0)
+    weights = np.asarray(weights, dtype=float)
+    n_criteria = weights.shape[0]
+    w0 = weights / weights.sum()
+
+    minimum_share = np.zeros(n_criteria)
+    maximum_share = np.ones(n_criteria)
+
+    pairs = _ranking_pairs(values, score_fn(values, w0), top_only, METHOD_DESCENDING[method])
+    if pairs.size == 0:
+        return minimum_share, maximum_share
+
+    # Direction of travel on the simplex for each criterion: w(u) = w0 + (u - u0) * direction
+    rest = 1 - w0
+    direction = -_safe_divide(w0[np.newaxis, :], rest[:, np.newaxis])
+    direction[np.arange(n_criteria), np.arange(n_criteria)] = 1.0
+    # A criterion that already holds all of the weight cannot move
+    direction[rest <= 0] = 0.0
+
+    def weights_at(u):
+        # u has shape (n_criteria, m) -> weights of shape (n_criteria, m, n_criteria)
+        return w0 + (u - w0[:, np.newaxis])[..., np.newaxis] * direction[:, np.newaxis, :]
+
+    def gaps(u):
+        # Score gap of every pair; u has shape (n_criteria, m) -> (n_criteria, m, n_pairs)
+        scores = score_fn(values, weights_at(u))
+        return scores[..., pairs[:, 0]] - scores[..., pairs[:, 1]]
+
+    def pair_gaps(u):
+        # Gap and its slope along the simplex direction, with one share per pair:
+        # u has shape (n_criteria, n_pairs) -> two arrays of shape (n_criteria, n_pairs)
+        w = weights_at(u)
+        scores = score_fn(values, w)
+        slopes = np.einsum('cpij,cj->cpi', jacobian_fn(values, w), direction)
+        index = np.arange(pairs.shape[0])
+        gap = scores[:, index, pairs[:, 0]] - scores[:, index, pairs[:, 1]]
+        slope = slopes[:, index, pairs[:, 0]] - slopes[:, index, pairs[:, 1]]
+        return gap, slope
+
+    # Batched grid over all criteria, including the reference share itself
+    grid = np.linspace(0, 1, n_grid)[np.newaxis, :].repeat(n_criteria, axis=0)
+    grid = np.sort(np.concatenate([grid, w0[:, np.newaxis]], axis=1), axis=1)
+    grid_gaps = gaps(grid)
+    reference_index = np.argmax(grid == w0[:, np.newaxis], axis=1)
+    reference_sign = np.sign(gaps(w0[:, np.newaxis])[:, 0, :])
+
+    for side in ('max', 'min'):
+        # Walk away from the reference share to the first grid point where each gap changes sign;
+        # lo keeps the reference sign and hi has crossed
+        lo = np.full((n_criteria, pairs.shape[0]), np.nan)
+        hi = np.full((n_criteria, pairs.shape[0]), np.nan)
+        for c in range(n_criteria):
+            if not direction[c].any():
+                continue
+            r = reference_index[c]
+            path = np.arange(r, grid.shape[1]) if side == 'max' else np.arange(r, -1, -1)
+            flipped = np.sign(grid_gaps[c, path, :]) != reference_sign[c]
+            # A pair tied at the reference weights breaks as soon as the weight moves
+            flipped[0] = reference_sign[c] == 0
+            has_flip = flipped.any(axis=0)
+            first = np.argmax(flipped, axis=0)
+            lo[c, has_flip] = grid[c, path[np.maximum(first - 1, 0)][has_flip]]
+            hi[c, has_flip] = grid[c, path[first][has_flip]]
+
+        # Refine every bracket at once with Newton steps, falling back to bisection
+        active = ~np.isnan(lo) & (lo != hi)
+        x = np.where(active, (lo + hi) / 2, 0.0)
+        for _ in range(max_iter):
+            if not active.any():
+                break
+            gap, slope = pair_gaps(x)
+            crossed = np.sign(gap) != reference_sign
+            hi = np.where(active & crossed, x, hi)
+            lo = np.where(active & ~crossed, x, lo)
+            newton = x - _safe_divide(gap, slope)
+            inside = (slope != 0) & (newton > np.fmin(lo, hi)) & (newton < np.fmax(lo, hi))
+            # Newton has converged when its step is negligible, even if one bracket end never moves
+            converged = active & inside & (np.abs(newton - x) <= tol)
+            hi = np.where(converged, newton, hi)
+            x = np.where(active, np.where(inside, newton, (lo + hi) / 2), x)
+            active &= ~converged & (np.abs(hi - lo) > tol)
+
+        if side == 'max':
+            bound = np.min(np.where(np.isnan(hi), np.inf, hi), axis=1)
+            maximum_share = np.where(np.isinf(bound), 1.0, bound)
+        else:
+            bound = np.max(np.where(np.isnan(hi), -np.inf, hi), axis=1)
+            minimum_share = np.where(np.isinf(bound), 0.0, bound)
+
+    return minimum_share, maximum_share
+
+def load_decision_matrix(file_path):
+    """
+    Read the alternatives, criterion values and criterion weights from an Excel file.
+
+    Returns:
+        dict: A dictionary containing:
+            - legend_name: Name of the legend column
+            - values: DataFrame of criterion values (alternatives x criteria)
+            - weights: Series of criterion weights
+        or None if the file could not be read
+    """
+    df = read_excel_file(file_path)
+    if df is None:
+        return None
+
+    try:
+        # Locate the 'Criteria Weight' row the same way app.js does
+        first_column = df.columns[0]
+        weight_rows = df.index[df[first_column] == 'Criteria Weight']
+        if len(weight_rows) == 0:
+            print(f"No 'Criteria Weight' row found for {os.path.basename(file_path)}")
+            return None
+        weights_row_index = weight_rows[0]
+
+        # Criteria with a non-zero weight, as selected by ExcelProcessor
+        weights_row = pd.to_numeric(df.iloc[weights_row_index][df.columns[1:]], errors='coerce')
+        criteria_columns = [col for col in weights_row.index if pd.notna(weights_row[col]) and weights_row[col] != 0]
+        if not criteria_columns:
+            print(f"No weighted criteria found for {os.path.basename(file_path)}")
+            return None
+
+        # Alternatives are listed between the column names row (index 1) and the weights row
+        names_row = df.iloc[1]
+        alternatives = df.iloc[2:weights_row_index]
+        alternatives = alternatives[alternatives[first_column].notna()]
+
+        values = alternatives[criteria_columns].apply(pd.to_numeric, errors='coerce').fillna(0)
+        values.index = alternatives[first_column].values
+        values.columns = names_row[criteria_columns].values
+
+        weights = weights_row[criteria_columns]
+        weights.index = values.columns
+
+        return {
+            'legend_name': names_row[first_column],
+            'values': values,
+            'weights': weights
+        }
+
+    except Exception as e:
+        print(f"Error processing {file_path}: {str(e)}")
+        return None
+
+def compute_sections(values, weights, method='topsis', legend_name='No.'):
+    """
+    Build tornado-style min/max weight sections for a method, laid out like the workbook rows.
+
+    Args:
+        values (DataFrame): Criterion values (alternatives x criteria)
+        weights (Series): Criterion weights
+        method (str): 'topsis' or 'cp'
+        legend_name (str): Name of the legend column (default: 'No.')
+
+    Returns:
+        dict: Section name -> DataFrame with the maximum row followed by the minimum row.
+              Unbounded maxima are NaN, matching the empty cells in the workbooks.
+    """
+    raw_weights = weights.values.astype(float)
+    # Weight held by the other criteria, used to map shares back to raw weights
+    rest = raw_weights.sum() - raw_weights
+
+    # Each normalised section and its raw-weight counterpart share one set of intervals
+    intervals = {
+        top_only: stability_intervals(values.values, raw_weights, method, top_only=top_only)
+        for top_only in (False, True)
+    }
+
+    sections_data = {}
+    for section_name in SECTION_NAMES:
+        minimum_share, maximum_share = intervals["Top:1" in section_name]
+
+        if "Normalised" in section_name:
+            minimum, maximum = minimum_share, maximum_share
+        else:
+            # Share u of the total corresponds to a raw weight of u * rest / (1 - u)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                minimum = minimum_share * rest / (1 - minimum_share)
+                maximum = np.where(maximum_share < 1, maximum_share * rest / (1 - maximum_share), np.nan)
+
+        # Rows are labelled as in the workbook, e.g. "Maximum Criteria Weight (Full Order)"
+        section_df = pd.DataFrame([maximum, minimum], columns=weights.index)
+        section_df.insert(0, legend_name, [f"Maximum {section_name}", f"Minimum {section_name}"])
+        sections_data[section_name] = section_df
+
+    return sections_data
+
+def main():
+    # Get all Excel files in the data directory
+    data_dir = os.path.join(os.getcwd(), 'data')
+    excel_files = []
+    for ext in ['*.xlsx', '*.xls']:
+        excel_files.extend(glob.glob(os.path.join(data_dir, ext)))
+
+    print(f"Found {len(excel_files)} Excel files")
+
+    for file_path in excel_files:
+        file_name_without_ext = os.path.splitext(os.path.basename(file_path))[0]
+
+        # Read each workbook once and run every method on it
+        matrix = load_decision_matrix(file_path)
+        if not matrix:
+            continue
+
+        for method in METHODS:
+            sections_data = compute_sections(matrix['values'], matrix['weights'], method, matrix['legend_name'])
+
+            # Create a subdirectory for each Excel file under each method's output directories
+            file_tornado_dir = os.path.join("image", f"tornado_diagrams_{method}", file_name_without_ext)
+            file_scatter_dir = os.path.join("image", f"scatter_plots_{method}", file_name_without_ext)
+            for output_dir in [file_tornado_dir, file_scatter_dir]:
+                if not os.path.exists(output_dir):
+                    os.makedirs(output_dir)
+
+            for section_name, section_data in sections_data.items():
+                # Create a clean section name for the output file
+                clean_section_name = section_name.replace(" ", "_").replace("(", "").replace(")", "").replace(":", "_")
+                title = f"{file_name_without_ext} - {method.upper()} - {section_name}"
+
+                create_tornado_diagram(section_data, title,
+                                       os.path.join(file_tornado_dir, f"{clean_section_name}.png"))
+
+                # Scatter plots use the percentage change relative to the reference weights
+                create_scatter_plot(calculate_percentage_change(section_data, matrix['weights']), title,
+                                    os.path.join(file_scatter_dir, f"{clean_section_name}.png"))
+
+if __name__ == "__main__":
+    main()
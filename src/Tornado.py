@@ -4,6 +4,8 @@ import os
 import pandas as pd
 from matplotlib.lines import Line2D
 import glob
+from Pipeline import run_pipeline
+from PercentageChang import read_excel_file
 
 def create_tornado_diagram(data, title, output_path=None):
     # Add data integrity check
@@ -212,10 +214,16 @@ def process_excel_file_direct(file_path):
     """
     Process Excel file directly to get original data for tornado diagrams
     """
+    df = read_excel_file(file_path)
+    if df is None:
+        return None
+    return extract_sections(df, file_path)
+
+def extract_sections(df, file_path):
+    """
+    Extract the original section data for tornado diagrams from a raw Excel sheet
+    """
     try:
-        # Read the Excel file
-        df = pd.read_excel(file_path)
-        
         # Get row 10 (index 9) to determine which columns to initially select
         row_10 = df.iloc[9]
         all_selected_columns = [col for col in df.columns if pd.notna(row_10[col]) and row_10[col] != 0]
@@ -286,8 +294,12 @@ def main():
     
     print(f"Found {len(excel_files)} Excel files")
     
-    # Generate tornado diagrams for each file and section
-    for file_path in excel_files:
+    def compute(file_path, df):
+        # Turn one workbook into the tornado diagrams to render
+        sections_data = extract_sections(df, file_path)
+        if not sections_data:
+            return
+        
         file_name_without_ext = os.path.splitext(os.path.basename(file_path))[0]
         
         # Create a subdirectory for each Excel file
@@ -295,18 +307,16 @@ def main():
         if not os.path.exists(file_output_dir):
             os.makedirs(file_output_dir)
         
-        # Process the Excel file directly
-        sections_data = process_excel_file_direct(file_path)
-        if sections_data:
-            for section_name, section_data in sections_data.items():
-                # Create a clean section name for the output file
-                clean_section_name = section_name.replace(" ", "_").replace("(", "").replace(")", "").replace(":", "_")
-                output_path = os.path.join(file_output_dir, f"{clean_section_name}.png")
-                
-                # Create and save the tornado diagram
-                create_tornado_diagram(section_data, 
-                                     f"{file_name_without_ext} - {section_name}",
-                                     output_path)
+        for section_name, section_data in sections_data.items():
+            # Create a clean section name for the output file
+            clean_section_name = section_name.replace(" ", "_").replace("(", "").replace(")", "").replace(":", "_")
+            output_path = os.path.join(file_output_dir, f"{clean_section_name}.png")
+            
+            yield (section_data, f"{file_name_without_ext} - {section_name}", output_path)
+    
+    # Read, compute and render the tornado diagrams as overlapping stages
+    stats = run_pipeline(excel_files, read_excel_file, compute, create_tornado_diagram)
+    stats.print_report()
 
 if __name__ == "__main__":
     main()